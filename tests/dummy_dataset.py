@@ -3,166 +3,223 @@ Modified from
 https://github.com/PyTorchLightning/PyTorch-Lightning-Bolts/blob/master/pl_bolts/datamodules/dummy_dataset.py#L5-L42
 """
 
-from typing import Sequence
+from functools import lru_cache
+from math import ceil
 
 import torch
-from torch.utils.data import DataLoader, Dataset
+from torch.utils.data import Dataset
 
 from ride.core import Configs, RideClassificationDataset, RideDataset
-from ride.utils.utils import some
+
+
+class BatchLoader:
+    """Light-weight stand-in for a DataLoader over an in-memory dataset.
+
+    Batches are sliced directly from the dataset tensors, skipping sampling,
+    collation and worker processes altogether.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        batch_size: int,
+        shuffle=False,
+        generator: torch.Generator = None,
+    ):
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.generator = generator
+        self._batches = self._collate(torch.arange(len(dataset)))
+
+    def _collate(self, order: torch.Tensor):
+        return [
+            [x, y, ids]
+            for x, y, ids in zip(
+                self.dataset._x[order].split(self.batch_size),
+                self.dataset._y[order].split(self.batch_size),
+                (order // 2).split(self.batch_size),
+            )
+        ]
+
+    def __iter__(self):
+        if self.shuffle:
+            order = torch.randperm(len(self.dataset), generator=self.generator)
+            return iter(self._collate(order))
+        return iter(self._batches)
+
+    def __len__(self):
+        return ceil(len(self.dataset) / self.batch_size)
 
 
 class MeanVarDataset(Dataset):
-    def __init__(self, input_shape: Sequence[int], num_samples=10000):
+    def __init__(self, x: torch.Tensor, y: torch.Tensor):
         super().__init__()
-        self.input_shape = input_shape
-        self.num_samples = num_samples
+        self.input_shape = tuple(x.shape[1:])
+        self.num_samples = len(x)
         self.output_shape = (2,)
+        self._x = x
+        self._y = y
 
     def __len__(self):
         return self.num_samples
 
     def __getitem__(self, idx):
-        x = torch.rand(self.input_shape)
-        y = torch.stack(
-            [
-                x.mean(),
-                x.var(),
-            ]
-        )
-        sample = [x, y, idx // 2]
+        sample = [self._x[idx], self._y[idx], idx // 2]
         return sample
 
 
+@lru_cache(maxsize=1)
+def _regression_configs() -> Configs:
+    c = Configs.collect(DummyRegressionDataLoader)
+    c.add(
+        name="input_shape",
+        type=int,
+        default=10,
+        strategy="constant",
+        description="Input shape for data.",
+    )
+    return c
+
+
 class DummyRegressionDataLoader(RideDataset):
     @staticmethod
     def configs() -> Configs:
-        c = Configs.collect(DummyRegressionDataLoader)
-        c.add(
-            name="input_shape",
-            type=int,
-            default=10,
-            strategy="constant",
-            description="Input shape for data.",
-        )
-        return c
+        return _regression_configs()
 
     def validate_attributes(self):
         RideDataset.validate_attributes(self)
-        for attr in DummyRegressionDataLoader.configs().names:
-            assert some(
-                self, f"hparams.{attr}"
-            ), f"ClassificationLifecycle should define `hparams.{attr}` but none was found."
+        hparams = getattr(self, "hparams", None)
+        missing = [
+            attr
+            for attr in DummyRegressionDataLoader.configs().names
+            if getattr(hparams, attr, None) is None
+        ]
+        assert (
+            not missing
+        ), f"ClassificationLifecycle should define `hparams` {missing} but none were found."
 
     def __init__(self, hparams):
-        num_workers = 1
         self.input_shape = (hparams.input_shape,)
         self.output_shape = 2
 
-        self._train_dataloader = DataLoader(
-            MeanVarDataset(self.input_shape, num_samples=65),
+        # Train, val and test splits are views into a single pool of samples
+        generator = torch.Generator().manual_seed(42)
+        x = torch.empty(65 + 4 + 10, *self.input_shape).uniform_(
+            0, 1, generator=generator
+        )
+        var, mean = torch.var_mean(x.reshape(len(x), -1), dim=1)
+        y = torch.stack((mean, var), dim=1)
+
+        self._train_dataloader = BatchLoader(
+            MeanVarDataset(x[:65], y[:65]),
             batch_size=hparams.batch_size,
-            num_workers=num_workers,
             shuffle=True,
-            pin_memory=num_workers > 1,
+            generator=generator,
         )
-        self._val_dataloader = DataLoader(
-            MeanVarDataset(self.input_shape, num_samples=4),
+        self._val_dataloader = BatchLoader(
+            MeanVarDataset(x[65:69], y[65:69]),
             batch_size=hparams.batch_size,
-            num_workers=num_workers,
             shuffle=False,
-            pin_memory=num_workers > 1,
         )
-        self._test_dataloader = DataLoader(
-            MeanVarDataset(self.input_shape, num_samples=10),
+        self._test_dataloader = BatchLoader(
+            MeanVarDataset(x[69:], y[69:]),
             batch_size=hparams.batch_size,
-            num_workers=num_workers,
             shuffle=False,
-            pin_memory=num_workers > 1,
         )
 
-    def train_dataloader(self) -> DataLoader:
+    def train_dataloader(self) -> BatchLoader:
         return self._train_dataloader
 
-    def val_dataloader(self) -> DataLoader:
+    def val_dataloader(self) -> BatchLoader:
         return self._val_dataloader
 
-    def test_dataloader(self) -> DataLoader:
+    def test_dataloader(self) -> BatchLoader:
         return self._test_dataloader
 
 
 class OverOneDataset(Dataset):
-    def __init__(self, input_shape: Sequence[int], num_samples=10000):
+    def __init__(self, x: torch.Tensor, y: torch.Tensor):
         super().__init__()
-        self.input_shape = input_shape
-        self.num_samples = num_samples
+        self.input_shape = tuple(x.shape[1:])
+        self.num_samples = len(x)
         self.output_shape = (2,)
         self.classes = ["0", "1"]
+        self._x = x
+        self._y = y
 
     def __len__(self):
         return self.num_samples
 
     def __getitem__(self, idx):
-        x = torch.randn(self.input_shape)
-        m = x.mean()
-        y = (m > 0).to(torch.long)
-        sample = [x, y, idx // 2]
+        sample = [self._x[idx], self._y[idx], idx // 2]
         return sample
 
 
+@lru_cache(maxsize=1)
+def _classification_configs() -> Configs:
+    c = Configs.collect(DummyClassificationDataLoader)
+    c.add(
+        name="input_shape",
+        type=int,
+        default=10,
+        strategy="constant",
+        description="Input shape for data.",
+    )
+    return c
+
+
 class DummyClassificationDataLoader(RideClassificationDataset):
     @staticmethod
     def configs() -> Configs:
-        c = Configs.collect(DummyClassificationDataLoader)
-        c.add(
-            name="input_shape",
-            type=int,
-            default=10,
-            strategy="constant",
-            description="Input shape for data.",
-        )
-        return c
+        return _classification_configs()
 
     def validate_attributes(self):
         RideClassificationDataset.validate_attributes(self)
-        for attr in DummyRegressionDataLoader.configs().names:
-            assert some(
-                self, f"hparams.{attr}"
-            ), f"ClassificationLifecycle should define `hparams.{attr}` but none was found."
+        hparams = getattr(self, "hparams", None)
+        missing = [
+            attr
+            for attr in DummyRegressionDataLoader.configs().names
+            if getattr(hparams, attr, None) is None
+        ]
+        assert (
+            not missing
+        ), f"ClassificationLifecycle should define `hparams` {missing} but none were found."
 
     def __init__(self, hparams):
-        num_workers = 1
         self.input_shape = (hparams.input_shape,)
         self.output_shape = 2
         self.classes = ["fee", "fei"]
 
-        self._train_dataloader = DataLoader(
-            OverOneDataset(self.input_shape, num_samples=65),
+        # Train, val and test splits are views into a single pool of samples
+        generator = torch.Generator().manual_seed(42)
+        x = torch.empty(65 + 4 + 10, *self.input_shape).normal_(
+            0, 1, generator=generator
+        )
+        y = (x.reshape(len(x), -1).mean(1) > 0).to(torch.long)
+
+        self._train_dataloader = BatchLoader(
+            OverOneDataset(x[:65], y[:65]),
             batch_size=hparams.batch_size,
-            num_workers=num_workers,
             shuffle=True,
-            pin_memory=num_workers > 1,
+            generator=generator,
         )
-        self._val_dataloader = DataLoader(
-            OverOneDataset(self.input_shape, num_samples=4),
+        self._val_dataloader = BatchLoader(
+            OverOneDataset(x[65:69], y[65:69]),
             batch_size=hparams.batch_size,
-            num_workers=num_workers,
             shuffle=False,
-            pin_memory=num_workers > 1,
         )
-        self._test_dataloader = DataLoader(
-            OverOneDataset(self.input_shape, num_samples=10),
+        self._test_dataloader = BatchLoader(
+            OverOneDataset(x[69:], y[69:]),
             batch_size=hparams.batch_size,
-            num_workers=num_workers,
             shuffle=False,
-            pin_memory=num_workers > 1,
         )
 
-    def train_dataloader(self) -> DataLoader:
+    def train_dataloader(self) -> BatchLoader:
         return self._train_dataloader
 
-    def val_dataloader(self) -> DataLoader:
+    def val_dataloader(self) -> BatchLoader:
         return self._val_dataloader
 
-    def test_dataloader(self) -> DataLoader:
+    def test_dataloader(self) -> BatchLoader:
         return self._test_dataloader
@@ -1,8 +1,10 @@
 import logging
+import os
+import random
 from argparse import ArgumentParser
 
+import numpy as np
 import pytest
-import pytorch_lightning as pl
 import torch
 
 from ride.core import AttributeDict, RideMixin, RideModule
@@ -11,7 +13,14 @@ from ride.utils.utils import DictLike
 
 from .dummy_dataset import DummyRegressionDataLoader
 
-pl.seed_everything(42)
+random.seed(42)
+np.random.seed(42)
+torch.manual_seed(42)
+
+# Opt-in compilation of test module forwards (requires torch>=2.0)
+COMPILE = bool(int(os.getenv("RIDE_COMPILE", default="0"))) and hasattr(
+    torch, "compile"
+)
 
 
 class Mixin1(RideMixin):
@@ -65,15 +74,23 @@ class DummyModule(
     #     return Configs.collect(DummyModule)
 
     def __init__(self):
-        self.lin = torch.nn.Linear(
-            self.input_shape[0],  # from DummyRegressionDataLoader
-            self.output_shape,  # from DummyRegressionDataLoader
+        self.weight = torch.nn.Parameter(
+            torch.empty(
+                self.output_shape,  # from DummyRegressionDataLoader
+                self.input_shape[0],  # from DummyRegressionDataLoader
+            )
         )
+        self.bias = torch.nn.Parameter(torch.zeros(self.output_shape))
+        torch.nn.init.kaiming_uniform_(self.weight, a=5 ** 0.5)
         # Alternative way of specifying loss:
         self.loss = torch.nn.functional.mse_loss
+        if COMPILE:
+            self.forward = torch.compile(
+                self.forward, mode="reduce-overhead", dynamic=False
+            )
 
     def forward(self, x: torch.Tensor) -> torch.Tensor:
-        return self.lin(x)
+        return torch.nn.functional.linear(x, self.weight, self.bias)
 
 
 def test_init_only_self():
@@ -122,14 +139,18 @@ def test_module_with_no_forward_warns(caplog):
             DummyRegressionDataLoader,
         ):
             def __init__(self):
-                self.lin = torch.nn.Linear(
-                    self.input_shape[0],  # from DummyRegressionDataLoader
-                    self.output_shape,  # from DummyRegressionDataLoader
+                self.weight = torch.nn.Parameter(
+                    torch.empty(
+                        self.output_shape,  # from DummyRegressionDataLoader
+                        self.input_shape[0],  # from DummyRegressionDataLoader
+                    )
                 )
+                self.bias = torch.nn.Parameter(torch.zeros(self.output_shape))
+                torch.nn.init.kaiming_uniform_(self.weight, a=5 ** 0.5)
 
             # Missing on purpose:
             # def forward(self, x: torch.Tensor) -> torch.Tensor:
-            #     return self.lin(x)
+            #     return torch.nn.functional.linear(x, self.weight, self.bias)
 
     assert len(caplog.messages) == 1
     assert "forward" in caplog.text
@@ -172,13 +193,17 @@ def test_default_methods_overload():
 
     class DummyModuleWithWarmup(RideModule, MyWarmup, DummyRegressionDataLoader):
         def __init__(self):
-            self.lin = torch.nn.Linear(
-                self.input_shape[0],  # from DummyRegressionDataLoader
-                self.output_shape,  # from DummyRegressionDataLoader
+            self.weight = torch.nn.Parameter(
+                torch.empty(
+                    self.output_shape,  # from DummyRegressionDataLoader
+                    self.input_shape[0],  # from DummyRegressionDataLoader
+                )
             )
+            self.bias = torch.nn.Parameter(torch.zeros(self.output_shape))
+            torch.nn.init.kaiming_uniform_(self.weight, a=5 ** 0.5)
 
         def forward(self, x):
-            return self.lin(x)
+            return torch.nn.functional.linear(x, self.weight, self.bias)
 
     parser = DummyModuleWithWarmup.configs().add_argparse_args(ArgumentParser())
     args, _ = parser.parse_known_args()